@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Palo Alto Firewall Rule Deployment via REST API (async)
+Asyncio/aiohttp variant of deploy_rule.py for concurrent multi-rule and
+multi-firewall deployments. The workload is pure I/O wait (HTTPS round-trips
+plus commit polling), so rules deploy in wall-clock time of roughly the
+slowest rule instead of the sum.
+"""
+
+import asyncio
+import json
+import os
+import ssl
+import sys
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+import aiohttp
+
+from deploy_rule import PaloAltoAPI, find_rule_files, load_rule_file
+
+# Cap concurrent requests so we don't overwhelm the firewall management plane
+MAX_CONCURRENT_REQUESTS = 50
+WORKER_COUNT = 5
+
+
+class AsyncPaloAltoAPI(PaloAltoAPI):
+    """Async Palo Alto Networks Firewall REST API Client.
+
+    Inherits the XML building/parsing helpers from PaloAltoAPI and replaces
+    every network method with an awaitable. Use as an async context manager
+    so the aiohttp session is created inside the running event loop.
+    """
+
+    def __init__(self, host: str, username: str = None, password: str = None, api_key: str = None, verify_ssl: bool = False):
+        # Deliberately not calling super().__init__: the aiohttp session must
+        # be created inside the event loop and keygen becomes awaitable.
+        self.host = host
+        self.base_url = f"https://{host}/api/"
+        self.api_key = api_key
+        self.username = username
+        self.password = password
+        self.verify_ssl = verify_ssl
+
+        if verify_ssl:
+            self.ssl_context = ssl.create_default_context()
+        else:
+            self.ssl_context = ssl.create_default_context()
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+
+        self.session = None
+
+    async def __aenter__(self) -> 'AsyncPaloAltoAPI':
+        connector = aiohttp.TCPConnector(ssl=self.ssl_context, limit=MAX_CONCURRENT_REQUESTS)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers={'Content-Type': 'application/x-www-form-urlencoded'},
+            timeout=aiohttp.ClientTimeout(total=60)
+        )
+
+        if not self.api_key and self.username and self.password:
+            self.api_key = await self._get_api_key()
+
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+
+    async def _get_api_key(self) -> str:
+        """Generate API key from username/password."""
+        params = {
+            'type': 'keygen',
+            'user': self.username,
+            'password': self.password
+        }
+        response = await self._make_request(params, use_key=False)
+        root = ET.fromstring(response)
+        key_elem = root.find('.//key')
+        if key_elem is not None:
+            return key_elem.text
+        raise Exception("Failed to generate API key")
+
+    async def _make_request(self, params: Dict[str, str], use_key: bool = True) -> str:
+        """Make API request to firewall."""
+        if use_key and self.api_key:
+            params['key'] = self.api_key
+
+        try:
+            async with self.session.get(self.base_url, params=params) as response:
+                body = await response.text()
+                if response.status >= 400:
+                    raise Exception(f"HTTP Error {response.status}: {body}")
+                return body
+        except aiohttp.ClientError as e:
+            raise Exception(f"Request Error: {e}")
+
+    async def get_system_info(self) -> Dict[str, Any]:
+        """Get firewall system information."""
+        params = {
+            'type': 'op',
+            'cmd': '<show><system><info></info></system></show>'
+        }
+        response = await self._make_request(params)
+        return self._parse_response(response)
+
+    async def get_existing_rule_names(self, vsys: str = 'vsys1') -> set:
+        """Fetch the entire rulebase once and return the set of existing rule names."""
+        xpath = f"/config/devices/entry[@name='localhost.localdomain']/vsys/entry[@name='{vsys}']/rulebase/security/rules"
+        params = {
+            'type': 'config',
+            'action': 'get',
+            'xpath': xpath
+        }
+        try:
+            response = await self._make_request(params)
+            root = ET.fromstring(response)
+            return {entry.get('name') for entry in root.iter('entry') if entry.get('name')}
+        except:
+            return set()
+
+    async def create_security_rule(self, rule: Dict[str, Any], vsys: str = 'vsys1', position: str = 'bottom') -> Dict[str, Any]:
+        """Create or update a security rule."""
+        rule_name = rule['rule_name']
+        element = self._build_rule_element(rule)
+        xpath = f"/config/devices/entry[@name='localhost.localdomain']/vsys/entry[@name='{vsys}']/rulebase/security/rules/entry[@name='{rule_name}']"
+
+        params = {
+            'type': 'config',
+            'action': 'set',
+            'xpath': xpath,
+            'element': element
+        }
+
+        response = await self._make_request(params)
+        return self._parse_response(response)
+
+    async def commit(self, description: str = None) -> Dict[str, Any]:
+        """Commit configuration changes."""
+        if description:
+            cmd = f'<commit><description>{self._escape_xml(description)}</description></commit>'
+        else:
+            cmd = '<commit></commit>'
+
+        params = {
+            'type': 'commit',
+            'cmd': cmd
+        }
+
+        response = await self._make_request(params)
+        root = ET.fromstring(response)
+        result = self._parse_response_root(root)
+
+        job_elem = root.find('.//job')
+        if job_elem is not None:
+            result['job_id'] = job_elem.text
+
+        return result
+
+    async def get_commit_status(self, job_id: str) -> Dict[str, Any]:
+        """Get the status of a commit job."""
+        params = {
+            'type': 'op',
+            'cmd': f'<show><jobs><id>{job_id}</id></jobs></show>'
+        }
+
+        response = await self._make_request(params)
+        return self._parse_job_status(response)
+
+    async def wait_for_commit(self, job_id: str, timeout: int = 300, max_poll_interval: int = 15) -> Tuple[bool, str]:
+        """Wait for a commit job to complete without blocking other tasks.
+
+        Same exponential-backoff polling as the sync client, with
+        asyncio.sleep so other firewalls' commit polls interleave.
+        """
+        start_time = time.time()
+        delay = 1.0
+        last_progress = -1
+
+        while time.time() - start_time < timeout:
+            status = await self.get_commit_status(job_id)
+
+            if status.get('status') == 'FIN':
+                if status.get('result') == 'OK':
+                    return True, "Commit successful"
+                else:
+                    return False, f"Commit failed: {status.get('details', 'Unknown error')}"
+
+            progress = status.get('progress', 0)
+            if progress != last_progress:
+                print(f"  Commit progress: {progress}%")
+                last_progress = progress
+
+            await asyncio.sleep(delay)
+            if progress >= 95:
+                delay = 1.0
+            else:
+                delay = min(delay * 2, max_poll_interval)
+
+        return False, "Commit timed out"
+
+
+async def deploy_rules_async(rule_files: List[str], dry_run: bool = False, environment: str = 'staging') -> Tuple[int, int]:
+    """Deploy firewall rules concurrently, then commit once.
+
+    Returns a (success_count, fail_count) tuple.
+    """
+    print()
+    print("=" * 70)
+    print(f"PALO ALTO FIREWALL RULE DEPLOYMENT (ASYNC)")
+    print("=" * 70)
+    print(f"Rule Files:  {len(rule_files)}")
+    print(f"Environment: {environment.upper()}")
+    print(f"Dry Run:     {dry_run}")
+    print(f"Timestamp:   {datetime.utcnow().isoformat()}Z")
+    print("=" * 70)
+
+    rules = []
+    fail_count = 0
+
+    for rule_file in rule_files:
+        try:
+            rules.append(load_rule_file(rule_file))
+        except Exception as e:
+            print(f"\nERROR: Failed to load rule file {rule_file}: {e}")
+            fail_count += 1
+
+    if not rules:
+        return 0, fail_count
+
+    if dry_run:
+        print("\n" + "-" * 70)
+        print("[DRY RUN] No changes will be made to the firewall")
+        print("-" * 70)
+        for rule in rules:
+            print(f"\nRule '{rule.get('rule_name', 'Unknown')}' would be deployed with the following configuration:")
+            print(json.dumps(rule, indent=2))
+        print("\n[DRY RUN] Deployment simulation completed successfully")
+        return len(rules), fail_count
+
+    firewall_ip = os.environ.get('PA_FIREWALL_IP')
+    username = os.environ.get('PA_USERNAME')
+    password = os.environ.get('PA_PASSWORD')
+    api_key = os.environ.get('PA_API_KEY')
+
+    if not firewall_ip:
+        print("\nERROR: PA_FIREWALL_IP environment variable not set")
+        return 0, fail_count + len(rules)
+
+    if not api_key and not (username and password):
+        print("\nERROR: Either PA_API_KEY or PA_USERNAME/PA_PASSWORD must be set")
+        return 0, fail_count + len(rules)
+
+    print(f"\nConnecting to firewall: {firewall_ip}")
+
+    try:
+        async with AsyncPaloAltoAPI(
+            host=firewall_ip,
+            username=username,
+            password=password,
+            api_key=api_key,
+            verify_ssl=False
+        ) as api:
+            print("  Testing connection...")
+            try:
+                await api.get_system_info()
+                print(f"  Connected successfully")
+            except Exception as e:
+                print(f"  WARNING: Could not get system info: {e}")
+
+            existing_names = await api.get_existing_rule_names()
+
+            # Small worker pool pulling from a queue so a large batch doesn't
+            # flood the management plane with simultaneous set requests
+            queue: asyncio.Queue = asyncio.Queue()
+            for rule in rules:
+                queue.put_nowait(rule)
+
+            errors: List[str] = []
+
+            async def worker():
+                while True:
+                    try:
+                        rule = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    rule_name = rule['rule_name']
+                    verb = 'Updating' if rule_name in existing_names else 'Creating'
+                    print(f"  {verb} rule '{rule_name}'...")
+                    try:
+                        result = await api.create_security_rule(rule, position=rule.get('position', 'bottom'))
+                        if result['status'] != 'success':
+                            errors.append(f"{rule_name}: {result.get('message', 'Unknown error')}")
+                    except Exception as e:
+                        errors.append(f"{rule_name}: {e}")
+                    finally:
+                        queue.task_done()
+
+            await asyncio.gather(*[worker() for _ in range(min(WORKER_COUNT, len(rules)))])
+
+            if errors:
+                for error in errors:
+                    print(f"  ERROR: Failed to create rule {error}")
+                return 0, fail_count + len(rules)
+
+            print(f"  {len(rules)} rule(s) pushed successfully")
+
+            # One commit for the whole batch
+            print(f"\n  Committing configuration...")
+            rule_names = ', '.join(rule['rule_name'] for rule in rules)
+            commit_desc = f"GitOps deployment - {rule_names} - {datetime.utcnow().isoformat()}"
+            commit_result = await api.commit(description=commit_desc)
+
+            if commit_result['status'] != 'success':
+                print(f"  WARNING: Commit may have failed: {commit_result.get('message', 'Unknown')}")
+
+            job_id = commit_result.get('job_id')
+            if job_id:
+                print(f"  Commit job ID: {job_id}")
+                print("  Waiting for commit to complete...")
+
+                success, message = await api.wait_for_commit(job_id)
+                if success:
+                    print(f"  {message}")
+                else:
+                    print(f"  ERROR: {message}")
+                    return 0, fail_count + len(rules)
+            else:
+                print("  Commit initiated (no job ID returned)")
+
+            print("\n" + "=" * 70)
+            print("DEPLOYMENT SUCCESSFUL")
+            print("=" * 70)
+            print(f"{len(rules)} rule(s) have been deployed to {firewall_ip}")
+            print("=" * 70)
+
+            return len(rules), fail_count
+
+    except Exception as e:
+        print(f"\nERROR: Deployment failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 0, fail_count + len(rules)
+
+
+async def main_async():
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Deploy Palo Alto firewall rules via API (async)')
+    parser.add_argument('rule_files', nargs='*', help='Rule files to deploy')
+    parser.add_argument('--dry-run', action='store_true', help='Simulate deployment without making changes')
+    parser.add_argument('--environment', '-e', default='staging', choices=['staging', 'production'],
+                        help='Target environment')
+    parser.add_argument('--all', action='store_true', help='Deploy all rules in firewall-rules directory')
+
+    args = parser.parse_args()
+
+    if args.rule_files and not args.all:
+        rule_files = args.rule_files
+    else:
+        rule_files = find_rule_files(Path(__file__).parent.parent / 'firewall-rules')
+
+    if not rule_files:
+        print("No rule files found to deploy")
+        sys.exit(0)
+
+    print(f"Found {len(rule_files)} rule file(s) to deploy")
+
+    missing_count = 0
+    existing_files = []
+
+    for rule_file in rule_files:
+        if not Path(rule_file).exists():
+            print(f"WARNING: Rule file not found: {rule_file}")
+            missing_count += 1
+        else:
+            existing_files.append(rule_file)
+
+    success_count, fail_count = await deploy_rules_async(existing_files, dry_run=args.dry_run, environment=args.environment)
+    fail_count += missing_count
+
+    print("\n" + "=" * 70)
+    print("DEPLOYMENT SUMMARY")
+    print("=" * 70)
+    print(f"Total:     {len(rule_files)}")
+    print(f"Succeeded: {success_count}")
+    print(f"Failed:    {fail_count}")
+    print("=" * 70)
+
+    sys.exit(0 if fail_count == 0 else 1)
+
+
+if __name__ == '__main__':
+    asyncio.run(main_async())
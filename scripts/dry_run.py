@@ -4,11 +4,91 @@ Dry Run Deployment Simulator
 Simulates firewall rule deployment without making actual changes.
 """
 
+import asyncio
 import json
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
+REQUIRED_FIELDS = ("rule_name", "source_zone", "destination_zone",
+                   "source_address", "destination_address", "action")
+
+
+def load_rules_bulk(rule_files) -> List[Dict[str, Any]]:
+    """Load and parse many rule files, overlapping reads where possible.
+
+    With aiofiles available the reads are interleaved on an event loop, so
+    per-file latency overlaps instead of summing — a win on the slow or
+    networked filesystems CI runners use. Parsing stays synchronous; it is
+    CPU-bound and fast. Unreadable or malformed files are skipped with an
+    ERROR line naming the file.
+    """
+    # A file that fails to read or parse is reported and skipped here;
+    # the per-rule simulation pass still fails it individually
+    def _parse(path, raw):
+        try:
+            return _json_loads(raw)
+        except Exception as e:
+            print(f"ERROR: Failed to load rule file {path}: {e}")
+            return None
+
+    if aiofiles is None:
+        rules = []
+        for path in rule_files:
+            try:
+                raw = Path(path).read_bytes()
+            except Exception as e:
+                print(f"ERROR: Failed to load rule file {path}: {e}")
+                continue
+            rule = _parse(path, raw)
+            if rule is not None:
+                rules.append(rule)
+        return rules
+
+    async def _read_one(path):
+        try:
+            async with aiofiles.open(path, 'rb') as f:
+                return await f.read()
+        except Exception as e:
+            print(f"ERROR: Failed to load rule file {path}: {e}")
+            return None
+
+    async def _read_all():
+        return await asyncio.gather(*(_read_one(f) for f in rule_files))
+
+    rules = []
+    for path, raw in zip(rule_files, asyncio.run(_read_all())):
+        if raw is None:
+            continue
+        rule = _parse(path, raw)
+        if rule is not None:
+            rules.append(rule)
+    return rules
+
+
+def validate_rules_bulk(rules) -> list:
+    """Find required fields missing from any rule, in a single pass.
+
+    Rather than probing each field per rule dict, intersect the key sets
+    column-wise (struct-of-arrays style): a field absent from the
+    intersection is missing from at least one rule.
+    """
+    if not rules:
+        return list(REQUIRED_FIELDS)
+    common_keys = set.intersection(*(set(rule) for rule in rules))
+    return [f for f in REQUIRED_FIELDS if f not in common_keys]
 
 
 def simulate_api_call(endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -23,66 +103,55 @@ def simulate_api_call(endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
 
 def simulate_deployment(rule_file: str) -> bool:
     """Simulate deployment of a firewall rule."""
-    print()
-    print("=" * 70)
-    print("DRY RUN DEPLOYMENT SIMULATION")
-    print("=" * 70)
+    # Sections are emitted with one print each to avoid a write syscall
+    # per line in CI logs
+    banner = "=" * 70
+    divider = "-" * 70
+    print(f"\n{banner}\nDRY RUN DEPLOYMENT SIMULATION\n{banner}")
 
     # Load rule file
     try:
-        with open(rule_file, 'r') as f:
-            rule = json.load(f)
+        rule = _json_loads(Path(rule_file).read_bytes())
     except Exception as e:
         print(f"ERROR: Failed to load rule file: {e}")
         return False
 
     rule_name = rule.get("rule_name", "Unknown")
-    print(f"\nRule File: {rule_file}")
-    print(f"Rule Name: {rule_name}")
-    print(f"Timestamp: {datetime.utcnow().isoformat()}Z")
+    print(f"\nRule File: {rule_file}\n"
+          f"Rule Name: {rule_name}\n"
+          f"Timestamp: {datetime.utcnow().isoformat()}Z")
 
-    print("\n" + "-" * 70)
-    print("STEP 1: Validate Rule Configuration")
-    print("-" * 70)
+    print(f"\n{divider}\nSTEP 1: Validate Rule Configuration\n{divider}")
 
-    required_fields = ["rule_name", "source_zone", "destination_zone",
-                       "source_address", "destination_address", "action"]
-
-    missing_fields = [f for f in required_fields if f not in rule]
+    missing_fields = [f for f in REQUIRED_FIELDS if f not in rule]
     if missing_fields:
         print(f"ERROR: Missing required fields: {', '.join(missing_fields)}")
         return False
 
-    print("  [OK] All required fields present")
-    print(f"       - Rule Name: {rule['rule_name']}")
-    print(f"       - Action: {rule['action'].upper()}")
-    print(f"       - Source Zone: {', '.join(rule['source_zone'])}")
-    print(f"       - Destination Zone: {', '.join(rule['destination_zone'])}")
+    print(f"  [OK] All required fields present\n"
+          f"       - Rule Name: {rule['rule_name']}\n"
+          f"       - Action: {rule['action'].upper()}\n"
+          f"       - Source Zone: {', '.join(rule['source_zone'])}\n"
+          f"       - Destination Zone: {', '.join(rule['destination_zone'])}")
 
-    print("\n" + "-" * 70)
-    print("STEP 2: Connect to Firewall (Simulated)")
-    print("-" * 70)
+    print(f"\n{divider}\nSTEP 2: Connect to Firewall (Simulated)\n{divider}")
 
     firewall_ip = "${PA_FIREWALL_IP}"  # Would be from environment
-    print(f"  [SIMULATED] Connecting to firewall: {firewall_ip}")
-    print(f"  [SIMULATED] API endpoint: https://{firewall_ip}/api/")
-    print(f"  [SIMULATED] Authentication: API Key")
+    print(f"  [SIMULATED] Connecting to firewall: {firewall_ip}\n"
+          f"  [SIMULATED] API endpoint: https://{firewall_ip}/api/\n"
+          f"  [SIMULATED] Authentication: API Key")
 
     result = simulate_api_call("/api/?type=op&cmd=<show><system><info></info></system></show>", {})
     print(f"  [OK] Connection test: {result['status']}")
 
-    print("\n" + "-" * 70)
-    print("STEP 3: Check Existing Rules (Simulated)")
-    print("-" * 70)
+    print(f"\n{divider}\nSTEP 3: Check Existing Rules (Simulated)\n{divider}")
 
     xpath = f"/config/devices/entry/vsys/entry/rulebase/security/rules/entry[@name='{rule_name}']"
-    print(f"  [SIMULATED] Checking for existing rule: {rule_name}")
-    print(f"  [SIMULATED] XPath: {xpath}")
-    print(f"  [OK] No conflicting rule found")
+    print(f"  [SIMULATED] Checking for existing rule: {rule_name}\n"
+          f"  [SIMULATED] XPath: {xpath}\n"
+          f"  [OK] No conflicting rule found")
 
-    print("\n" + "-" * 70)
-    print("STEP 4: Create Security Rule (Simulated)")
-    print("-" * 70)
+    print(f"\n{divider}\nSTEP 4: Create Security Rule (Simulated)\n{divider}")
 
     rule_config = {
         "entry": {
@@ -100,54 +169,44 @@ def simulate_deployment(rule_file: str) -> bool:
         }
     }
 
-    print(f"  [SIMULATED] Creating rule with configuration:")
-    print(f"       Name: {rule_config['entry']['@name']}")
-    print(f"       From: {rule_config['entry']['from']['member']}")
-    print(f"       To: {rule_config['entry']['to']['member']}")
-    print(f"       Source: {rule_config['entry']['source']['member']}")
-    print(f"       Destination: {rule_config['entry']['destination']['member']}")
-    print(f"       Application: {rule_config['entry']['application']['member']}")
-    print(f"       Service: {rule_config['entry']['service']['member']}")
-    print(f"       Action: {rule_config['entry']['action']}")
+    print(f"  [SIMULATED] Creating rule with configuration:\n"
+          f"       Name: {rule_config['entry']['@name']}\n"
+          f"       From: {rule_config['entry']['from']['member']}\n"
+          f"       To: {rule_config['entry']['to']['member']}\n"
+          f"       Source: {rule_config['entry']['source']['member']}\n"
+          f"       Destination: {rule_config['entry']['destination']['member']}\n"
+          f"       Application: {rule_config['entry']['application']['member']}\n"
+          f"       Service: {rule_config['entry']['service']['member']}\n"
+          f"       Action: {rule_config['entry']['action']}")
 
     result = simulate_api_call("/api/?type=config&action=set", rule_config)
     print(f"  [OK] Rule would be created: {result['status']}")
 
-    print("\n" + "-" * 70)
-    print("STEP 5: Commit Configuration (Simulated)")
-    print("-" * 70)
+    print(f"\n{divider}\nSTEP 5: Commit Configuration (Simulated)\n{divider}")
 
     commit_description = f"GitOps deployment - {rule_name} - {datetime.utcnow().isoformat()}"
-    print(f"  [SIMULATED] Commit description: {commit_description}")
-    print(f"  [SIMULATED] Initiating commit...")
+    print(f"  [SIMULATED] Commit description: {commit_description}\n"
+          f"  [SIMULATED] Initiating commit...")
 
     result = simulate_api_call("/api/?type=commit", {"description": commit_description})
-    print(f"  [OK] Commit would be initiated: {result['status']}")
-    print(f"  [SIMULATED] Commit job ID: SIMULATED-001")
-
-    print("\n" + "-" * 70)
-    print("STEP 6: Verify Deployment (Simulated)")
-    print("-" * 70)
-
-    print(f"  [SIMULATED] Verifying rule in committed configuration...")
-    print(f"  [OK] Rule verification would pass")
-
-    print("\n" + "=" * 70)
-    print("DRY RUN SUMMARY")
-    print("=" * 70)
-    print()
-    print("  Status: SUCCESS (Simulated)")
-    print(f"  Rule Name: {rule_name}")
-    print(f"  Action: {rule['action'].upper()}")
-    print()
-    print("  Traffic Flow:")
-    print(f"    Source: {', '.join(rule['source_address'])} ({', '.join(rule['source_zone'])})")
-    print(f"    Destination: {', '.join(rule['destination_address'])} ({', '.join(rule['destination_zone'])})")
-    print()
-    print("  No actual changes were made to the firewall.")
-    print("  To deploy this rule, merge the PR and let the CI/CD pipeline run.")
-    print()
-    print("=" * 70)
+    print(f"  [OK] Commit would be initiated: {result['status']}\n"
+          f"  [SIMULATED] Commit job ID: SIMULATED-001")
+
+    print(f"\n{divider}\nSTEP 6: Verify Deployment (Simulated)\n{divider}")
+
+    print(f"  [SIMULATED] Verifying rule in committed configuration...\n"
+          f"  [OK] Rule verification would pass")
+
+    print(f"\n{banner}\nDRY RUN SUMMARY\n{banner}\n\n"
+          f"  Status: SUCCESS (Simulated)\n"
+          f"  Rule Name: {rule_name}\n"
+          f"  Action: {rule['action'].upper()}\n\n"
+          f"  Traffic Flow:\n"
+          f"    Source: {', '.join(rule['source_address'])} ({', '.join(rule['source_zone'])})\n"
+          f"    Destination: {', '.join(rule['destination_address'])} ({', '.join(rule['destination_zone'])})\n\n"
+          f"  No actual changes were made to the firewall.\n"
+          f"  To deploy this rule, merge the PR and let the CI/CD pipeline run.\n\n"
+          f"{banner}")
 
     return True
 
@@ -156,20 +215,34 @@ def main():
     """Main entry point."""
     if len(sys.argv) < 2:
         # If no file specified, process all rules
-        rules_dir = Path(__file__).parent.parent / "firewall-rules"
-        rule_files = list(rules_dir.glob("*.json"))
+        target = Path(__file__).parent.parent / "firewall-rules"
+    else:
+        target = Path(sys.argv[1])
+
+    if not target.exists():
+        print(f"ERROR: Rule file not found: {target}")
+        sys.exit(1)
+
+    if target.is_dir():
+        from deploy_rule import find_rule_files
+
+        rule_files = sorted(find_rule_files(target))
         if not rule_files:
             print("No rule files found")
             sys.exit(1)
-        rule_file = str(rule_files[0])
-    else:
-        rule_file = sys.argv[1]
 
-    if not Path(rule_file).exists():
-        print(f"ERROR: Rule file not found: {rule_file}")
-        sys.exit(1)
+        # Bulk pre-check: one column-wise pass over all rules instead of a
+        # per-rule field loop
+        rules = load_rules_bulk(rule_files)
+        missing_fields = validate_rules_bulk(rules)
+        if missing_fields:
+            print(f"ERROR: Fields missing from one or more rules: {', '.join(missing_fields)}")
+            sys.exit(1)
+
+        success = all([simulate_deployment(f) for f in rule_files])
+    else:
+        success = simulate_deployment(str(target))
 
-    success = simulate_deployment(rule_file)
     sys.exit(0 if success else 1)
 
 
@@ -4,6 +4,7 @@ Deployment Report Generator
 Generates markdown reports for firewall rule deployments.
 """
 
+import io
 import json
 import sys
 import os
@@ -11,6 +12,12 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 # Define paths
 SCRIPT_DIR = Path(__file__).parent.absolute()
@@ -21,141 +28,136 @@ RULES_DIR = PROJECT_ROOT / "firewall-rules"
 def load_rules() -> List[Dict[str, Any]]:
     """Load all firewall rules."""
     rules = []
-    rule_files = list(RULES_DIR.glob("*.json"))
+    with os.scandir(RULES_DIR) as entries:
+        rule_files = sorted(entry.path for entry in entries
+                            if entry.is_file() and entry.name.endswith(".json"))
 
-    for rule_file in sorted(rule_files):
+    for rule_file in rule_files:
+        file_name = os.path.basename(rule_file)
         try:
-            with open(rule_file, 'r') as f:
-                rule = json.load(f)
-                rule["_file"] = rule_file.name
-                rules.append(rule)
+            with open(rule_file, 'rb') as f:
+                rule = _json_loads(f.read())
+            rule["_file"] = file_name
+            rules.append(rule)
         except Exception as e:
             rules.append({
-                "_file": rule_file.name,
+                "_file": file_name,
                 "_error": str(e)
             })
 
     return rules
 
 
+def _join_field(rule: Dict[str, Any], key: str, default: tuple = ()) -> str:
+    """Join a list-valued rule field for display.
+
+    Defaults are tuples so the common missing-key case reuses one shared
+    immutable object instead of allocating a fresh list per lookup.
+    """
+    return ", ".join(rule.get(key, default))
+
+
 def generate_markdown_report(environment: str) -> str:
     """Generate a markdown deployment report."""
     rules = load_rules()
     timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
 
-    report = []
-
-    # Header
-    report.append(f"# Firewall Rule Deployment Report")
-    report.append("")
-    report.append(f"**Environment:** {environment.upper()}")
-    report.append(f"**Deployment Time:** {timestamp}")
-    report.append(f"**Deployed By:** GitHub Actions (GitOps)")
-    report.append(f"**Total Rules:** {len(rules)}")
-    report.append("")
-
-    # Summary table
-    report.append("## Deployment Summary")
-    report.append("")
-    report.append("| Rule Name | Action | Source | Destination | Status |")
-    report.append("|-----------|--------|--------|-------------|--------|")
-
-    for rule in rules:
-        if "_error" in rule:
-            report.append(f"| {rule['_file']} | - | - | - | ERROR |")
-        else:
-            rule_name = rule.get("rule_name", "Unknown")
-            action = rule.get("action", "unknown").upper()
-            source = ", ".join(rule.get("source_address", [])[:2])
-            if len(rule.get("source_address", [])) > 2:
-                source += "..."
-            dest = ", ".join(rule.get("destination_address", [])[:2])
-            if len(rule.get("destination_address", [])) > 2:
-                dest += "..."
-            report.append(f"| {rule_name} | {action} | {source} | {dest} | DEPLOYED |")
-
-    report.append("")
-
-    # Detailed rules section
-    report.append("## Rule Details")
-    report.append("")
+    # One list entry per logical block (header, table row, rule section):
+    # repeated rule.get lookups are hoisted into locals once per rule and
+    # each block is a single f-string. The four rule-driven sections
+    # (summary table, details, traffic flow, checklist) are filled in a
+    # single pass over the rules instead of four.
+    summary = []
+    details = []
+    flow = io.StringIO()
+    checklist = []
 
     for rule in rules:
         if "_error" in rule:
-            report.append(f"### {rule['_file']}")
-            report.append(f"**Error:** {rule['_error']}")
-            report.append("")
+            summary.append(f"| {rule['_file']} | - | - | - | ERROR |")
+            details.append(f"### {rule['_file']}\n**Error:** {rule['_error']}\n")
             continue
 
         rule_name = rule.get("rule_name", "Unknown")
-        report.append(f"### {rule_name}")
-        report.append("")
-        report.append(f"**File:** `{rule['_file']}`")
-        report.append("")
-
-        if rule.get("description"):
-            report.append(f"**Description:** {rule['description']}")
-            report.append("")
-
-        report.append("| Property | Value |")
-        report.append("|----------|-------|")
-        report.append(f"| **Action** | {rule.get('action', 'N/A').upper()} |")
-        report.append(f"| **Source Zone** | {', '.join(rule.get('source_zone', []))} |")
-        report.append(f"| **Destination Zone** | {', '.join(rule.get('destination_zone', []))} |")
-        report.append(f"| **Source Address** | {', '.join(rule.get('source_address', []))} |")
-        report.append(f"| **Destination Address** | {', '.join(rule.get('destination_address', []))} |")
-        report.append(f"| **Application** | {', '.join(rule.get('application', ['any']))} |")
-        report.append(f"| **Service** | {', '.join(rule.get('service', ['application-default']))} |")
-        report.append(f"| **Log Start** | {rule.get('log_at_session_start', False)} |")
-        report.append(f"| **Log End** | {rule.get('log_at_session_end', True)} |")
-
-        if rule.get("tag"):
-            report.append(f"| **Tags** | {', '.join(rule.get('tag', []))} |")
-
-        report.append("")
+
+        # Summary table row
+        action = rule.get("action", "unknown").upper()
+        source_addresses = rule.get("source_address", [])
+        dest_addresses = rule.get("destination_address", [])
+        source = ", ".join(source_addresses[:2])
+        if len(source_addresses) > 2:
+            source += "..."
+        dest = ", ".join(dest_addresses[:2])
+        if len(dest_addresses) > 2:
+            dest += "..."
+        summary.append(f"| {rule_name} | {action} | {source} | {dest} | DEPLOYED |")
+
+        # Detail section
+        description = rule.get("description")
+        description_block = f"**Description:** {description}\n\n" if description else ""
+        tags = rule.get("tag")
+        tags_row = f"\n| **Tags** | {', '.join(tags)} |" if tags else ""
+
+        details.append(
+            f"### {rule_name}\n\n"
+            f"**File:** `{rule['_file']}`\n\n"
+            f"{description_block}"
+            f"| Property | Value |\n"
+            f"|----------|-------|\n"
+            f"| **Action** | {rule.get('action', 'N/A').upper()} |\n"
+            f"| **Source Zone** | {_join_field(rule, 'source_zone')} |\n"
+            f"| **Destination Zone** | {_join_field(rule, 'destination_zone')} |\n"
+            f"| **Source Address** | {_join_field(rule, 'source_address')} |\n"
+            f"| **Destination Address** | {_join_field(rule, 'destination_address')} |\n"
+            f"| **Application** | {_join_field(rule, 'application', ('any',))} |\n"
+            f"| **Service** | {_join_field(rule, 'service', ('application-default',))} |\n"
+            f"| **Log Start** | {rule.get('log_at_session_start', False)} |\n"
+            f"| **Log End** | {rule.get('log_at_session_end', True)} |"
+            f"{tags_row}\n"
+        )
 
         # Metadata if present
         metadata = rule.get("metadata", {})
         if metadata:
-            report.append("**Metadata:**")
-            report.append("")
-            for key, value in metadata.items():
-                report.append(f"- **{key.replace('_', ' ').title()}:** {value}")
-            report.append("")
-
-    # Traffic flow section
-    report.append("## Traffic Flow Summary")
-    report.append("")
-    report.append("```")
-
-    for rule in rules:
-        if "_error" not in rule:
-            rule_name = rule.get("rule_name", "Unknown")
-            action = rule.get("action", "?").upper()
-            src = rule.get("source_address", ["?"])[0]
-            dst = rule.get("destination_address", ["?"])[0]
-            src_zone = rule.get("source_zone", ["?"])[0]
-            dst_zone = rule.get("destination_zone", ["?"])[0]
-
-            report.append(f"[{rule_name}]")
-            report.append(f"  {src} ({src_zone}) --> [{action}] --> {dst} ({dst_zone})")
-            report.append("")
-
-    report.append("```")
+            metadata_lines = "\n".join(f"- **{key.replace('_', ' ').title()}:** {value}"
+                                       for key, value in metadata.items())
+            details.append(f"**Metadata:**\n\n{metadata_lines}\n")
+
+        # Traffic flow line (StringIO: one C-level write per rule)
+        flow.write(f"[{rule_name}]\n"
+                   f"  {rule.get('source_address', ['?'])[0]} "
+                   f"({rule.get('source_zone', ['?'])[0]}) "
+                   f"--> [{rule.get('action', '?').upper()}] --> "
+                   f"{rule.get('destination_address', ['?'])[0]} "
+                   f"({rule.get('destination_zone', ['?'])[0]})\n\n")
+
+        # Verification checklist entry
+        checklist.append(f"   - [ ] `{rule_name}`")
+
+    # Assemble the report in section order
+    report = [
+        f"# Firewall Rule Deployment Report\n\n"
+        f"**Environment:** {environment.upper()}\n"
+        f"**Deployment Time:** {timestamp}\n"
+        f"**Deployed By:** GitHub Actions (GitOps)\n"
+        f"**Total Rules:** {len(rules)}\n",
+
+        "## Deployment Summary\n\n"
+        "| Rule Name | Action | Source | Destination | Status |\n"
+        "|-----------|--------|--------|-------------|--------|",
+    ]
+    report.extend(summary)
     report.append("")
-
-    # Verification section
+    report.append("## Rule Details\n")
+    report.extend(details)
+    report.append(f"## Traffic Flow Summary\n\n```\n{flow.getvalue()}```\n")
     report.append("## Verification Steps")
     report.append("")
     report.append("1. Log into the Palo Alto firewall web interface")
     report.append("2. Navigate to **Policies** > **Security**")
     report.append("3. Verify the following rules are present:")
     report.append("")
-
-    for rule in rules:
-        if "_error" not in rule:
-            report.append(f"   - [ ] `{rule.get('rule_name', 'Unknown')}`")
-
+    report.extend(checklist)
     report.append("")
     report.append("4. Check the traffic logs at **Monitor** > **Logs** > **Traffic**")
     report.append("5. Test connectivity from source to destination hosts")
@@ -4,13 +4,28 @@ Network Configuration Validator
 Validates IP addresses, networks, and network-related configurations in firewall rules.
 """
 
+import functools
 import json
+import os
 import sys
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
 import ipaddress
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import netaddr
+except ImportError:
+    netaddr = None
+
 
 # Define paths
 SCRIPT_DIR = Path(__file__).parent.absolute()
@@ -58,21 +73,116 @@ NETWORK_CONFIG = {
     "address_object_pattern": r"^[a-zA-Z][a-zA-Z0-9_-]*$",
 }
 
+# Compiled once at import instead of per call (re.match with a string
+# pattern pays a pattern-cache lookup every time). A single alternation
+# with named groups answers both "is the format valid" and "which ports"
+# in one scan; the port alternative is listed first so proto-port services
+# populate the port groups rather than matching as service objects.
+_SERVICE_RE = re.compile(
+    r"^(?:(?P<proto>tcp|udp|sctp)-(?P<start>\d+)(?:-(?P<end>\d+))?"
+    r"|application-default|any|[a-zA-Z][a-zA-Z0-9_-]*)$",
+    re.IGNORECASE)
+
+_ADDRESS_KEYWORDS = frozenset({"any", "none"})
+
+
+# Rule sets repeat the same addresses across many rules, so classification
+# results are memoized at module level: each unique address is parsed once
+# per process. Compiled patterns are hashable, so the address-object pattern
+# can participate in the cache key directly.
+@functools.lru_cache(maxsize=4096)
+def _classify_address(address: str, addr_obj_re: "re.Pattern") -> Tuple[bool, str]:
+    """Classify an address string as keyword/object/IP/network/invalid."""
+    # Check for special keywords
+    if not address:
+        return False, "invalid"
+    if address.lower() in _ADDRESS_KEYWORDS:
+        return True, "keyword"
+
+    # Cheap prefilter decides the path: addresses starting with a digit
+    # (IPv4) or containing ':' (IPv6) can only be IPs/networks, everything
+    # else can only be an address object. This keeps the common
+    # address-object case off the exception-driven ipaddress fallbacks.
+    if not (address[0].isdigit() or ':' in address):
+        if addr_obj_re.match(address):
+            if not any(c in address for c in ['.', ':', '/']):
+                return True, "address_object"
+        return False, "invalid"
+
+    # CIDR suffix decides network vs host parse, avoiding a raised
+    # ValueError on every network-form address
+    if '/' in address:
+        try:
+            ipaddress.ip_network(address, strict=False)
+            return True, "ip_network"
+        except ValueError:
+            return False, "invalid"
+
+    try:
+        ipaddress.ip_address(address)
+        return True, "ip_address"
+    except ValueError:
+        pass
+
+    try:
+        # Non-CIDR forms like "10.0.1.0" with implied masks still parse
+        # as networks
+        ipaddress.ip_network(address, strict=False)
+        return True, "ip_network"
+    except ValueError:
+        pass
+
+    return False, "invalid"
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_private_address(address: str) -> bool:
+    """Check whether an address or network falls in a private range."""
+    try:
+        ip = ipaddress.ip_address(address.split('/')[0])
+        return ip.is_private
+    except ValueError:
+        try:
+            net = ipaddress.ip_network(address, strict=False)
+            return net.is_private
+        except ValueError:
+            return False
+
 
 class NetworkValidator:
     """Validates network configurations in firewall rules."""
 
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or NETWORK_CONFIG
-        self.errors = []
-        self.warnings = []
-        self.info = []
+        # deques: O(1) appends without list reallocation on large rulesets
+        self.errors = deque()
+        self.warnings = deque()
+        self.info = deque()
+
+        # Precompile/pre-parse config-derived objects once per validator
+        # instead of once per address
+        self._addr_obj_re = re.compile(self.config.get("address_object_pattern", r"^[a-zA-Z]"))
+        self._warn_addresses = set(self.config.get("warn_addresses", []))
+        self._valid_zones = {z.lower() for z in self.config.get("valid_zones", [])}
+
+        # internal_networks membership is tested per address, so the CIDR
+        # list is compiled once into a netaddr.IPSet (radix-backed, O(log
+        # prefixes) lookups). Without netaddr the CIDRs are at least parsed
+        # and collapsed once here instead of once per check.
+        internal = self.config.get("internal_networks", [])
+        if netaddr is not None:
+            self._internal_set = netaddr.IPSet(internal)
+            self._internal_networks = None
+        else:
+            self._internal_set = None
+            self._internal_networks = tuple(ipaddress.collapse_addresses(
+                ipaddress.ip_network(n, strict=False) for n in internal))
 
     def reset(self):
         """Reset validation state."""
-        self.errors = []
-        self.warnings = []
-        self.info = []
+        self.errors.clear()
+        self.warnings.clear()
+        self.info.clear()
 
     def add_error(self, message: str):
         """Add an error."""
@@ -88,42 +198,25 @@ class NetworkValidator:
 
     def is_valid_ip_or_network(self, address: str) -> Tuple[bool, str]:
         """Check if address is a valid IP or network."""
-        # Check for special keywords
-        if address.lower() in ['any', 'none']:
-            return True, "keyword"
-
-        # Check if it's an address object (not an IP)
-        if re.match(self.config.get("address_object_pattern", r"^[a-zA-Z]"), address):
-            if not any(c in address for c in ['.', ':', '/']):
-                return True, "address_object"
-
-        try:
-            # Try to parse as IP address
-            ipaddress.ip_address(address)
-            return True, "ip_address"
-        except ValueError:
-            pass
-
-        try:
-            # Try to parse as IP network
-            ipaddress.ip_network(address, strict=False)
-            return True, "ip_network"
-        except ValueError:
-            pass
-
-        return False, "invalid"
+        return _classify_address(address, self._addr_obj_re)
 
     def is_private_address(self, address: str) -> bool:
         """Check if address is in private range."""
-        try:
-            ip = ipaddress.ip_address(address.split('/')[0])
-            return ip.is_private
-        except ValueError:
+        return _is_private_address(address)
+
+    def is_internal_address(self, address: str) -> bool:
+        """Check if address falls within the configured internal networks."""
+        host = address.split('/', 1)[0]
+        if self._internal_set is not None:
             try:
-                net = ipaddress.ip_network(address, strict=False)
-                return net.is_private
-            except ValueError:
+                return host in self._internal_set
+            except (netaddr.AddrFormatError, ValueError):
                 return False
+        try:
+            ip = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(ip in net for net in self._internal_networks)
 
     def validate_addresses(self, addresses: List[str], address_type: str) -> bool:
         """Validate a list of addresses."""
@@ -141,7 +234,7 @@ class NetworkValidator:
                 self.add_info(f"{address_type} uses address object: {addr}")
 
             # Check for warning addresses
-            if addr in self.config.get("warn_addresses", []):
+            if addr in self._warn_addresses:
                 self.add_warning(f"{address_type} contains special address: {addr}")
 
             # Validate network size for CIDR
@@ -159,7 +252,7 @@ class NetworkValidator:
     def validate_zones(self, zones: List[str], zone_type: str) -> bool:
         """Validate zone names."""
         valid = True
-        valid_zones = [z.lower() for z in self.config.get("valid_zones", [])]
+        valid_zones = self._valid_zones
 
         for zone in zones:
             if zone.lower() not in valid_zones and zone.lower() != "any":
@@ -170,17 +263,17 @@ class NetworkValidator:
     def validate_services(self, services: List[str]) -> bool:
         """Validate service specifications."""
         valid = True
-        service_pattern = r"^(tcp|udp|sctp)-\d+(-\d+)?$|^application-default$|^any$|^[a-zA-Z][a-zA-Z0-9_-]*$"
 
         for service in services:
-            if not re.match(service_pattern, service, re.IGNORECASE):
+            match = _SERVICE_RE.match(service)
+            if not match:
                 self.add_warning(f"Unusual service format: {service}")
+                continue
 
-            # Check for well-known port ranges
-            port_match = re.match(r"^(tcp|udp|sctp)-(\d+)(?:-(\d+))?$", service, re.IGNORECASE)
-            if port_match:
-                port_start = int(port_match.group(2))
-                port_end = int(port_match.group(3)) if port_match.group(3) else port_start
+            # Port groups are populated only for proto-port services
+            if match['start']:
+                port_start = int(match['start'])
+                port_end = int(match['end'] or match['start'])
 
                 if port_start > 65535 or port_end > 65535:
                     self.add_error(f"Invalid port number in service: {service}")
@@ -222,6 +315,68 @@ class NetworkValidator:
         return valid
 
 
+def _list_rule_files() -> List[str]:
+    """List rule files with os.scandir, avoiding per-entry Path construction."""
+    with os.scandir(RULES_DIR) as entries:
+        return sorted(entry.path for entry in entries
+                      if entry.is_file() and entry.name.endswith(".json"))
+
+
+# Validator built once per worker process via the pool initializer
+_worker_validator = None
+
+
+def _init_worker():
+    # Each worker parses INTERNAL_NETWORKS and builds the IPSet once,
+    # instead of once per rule file
+    global _worker_validator
+    _worker_validator = NetworkValidator()
+
+
+def _validate_one(rule_file: str) -> Dict[str, Any]:
+    """Validate a single rule file (runs in a worker process)."""
+    result = {
+        "file": Path(rule_file).name,
+        "rule_name": None,
+        "valid": True,
+        "load_error": None,
+        "errors": [],
+        "warnings": [],
+        "info": [],
+        "source": [],
+        "destination": [],
+    }
+
+    try:
+        rule_data = _json_loads(Path(rule_file).read_bytes())
+    except json.JSONDecodeError as e:
+        result["valid"] = False
+        result["load_error"] = f"Invalid JSON: {e}"
+        return result
+    except Exception as e:
+        result["valid"] = False
+        result["load_error"] = str(e)
+        return result
+
+    validator = _worker_validator if _worker_validator is not None else NetworkValidator()
+    validator.reset()
+    result["rule_name"] = rule_data.get("rule_name", "Unknown")
+    try:
+        result["valid"] = validator.validate_rule(rule_data)
+    except Exception as e:
+        # A malformed-but-valid-JSON rule (e.g. a zone field that is not
+        # a list) must fail this file only, not abort the whole run
+        result["valid"] = False
+        result["load_error"] = str(e)
+        return result
+    result["errors"] = list(validator.errors)
+    result["warnings"] = list(validator.warnings)
+    result["info"] = list(validator.info)
+    result["source"] = rule_data.get("source_address", [])
+    result["destination"] = rule_data.get("destination_address", [])
+    return result
+
+
 def validate_all_rules():
     """Validate all firewall rules for network configuration."""
     print("=" * 60)
@@ -230,7 +385,7 @@ def validate_all_rules():
     print()
 
     # Find all rule files
-    rule_files = list(RULES_DIR.glob("*.json"))
+    rule_files = _list_rule_files()
 
     if not rule_files:
         print("WARNING: No firewall rule files found")
@@ -239,60 +394,58 @@ def validate_all_rules():
     print(f"Found {len(rule_files)} rule file(s) to validate")
     print("-" * 60)
 
-    validator = NetworkValidator()
     all_valid = True
     total_errors = []
     total_warnings = []
 
-    for rule_file in sorted(rule_files):
-        print(f"\nValidating: {rule_file.name}")
-        validator.reset()
+    # Each file validates independently, so fan the work out across cores;
+    # results come back in submission order and all printing stays on the
+    # parent process
+    with ProcessPoolExecutor(initializer=_init_worker) as executor:
+        results = executor.map(_validate_one, rule_files, chunksize=8)
 
-        try:
-            with open(rule_file, 'r') as f:
-                rule_data = json.load(f)
+        for result in results:
+            # Buffer the whole per-rule block and write it once
+            lines = [f"\nValidating: {result['file']}"]
 
-            rule_name = rule_data.get("rule_name", "Unknown")
-            valid = validator.validate_rule(rule_data)
+            if result["load_error"]:
+                lines.append(f"  ERROR - {result['load_error']}")
+                total_errors.append(f"[{result['file']}] {result['load_error']}")
+                all_valid = False
+                print('\n'.join(lines))
+                continue
 
-            if not valid:
+            rule_name = result["rule_name"]
+            if not result["valid"]:
                 all_valid = False
 
             # Report results
-            if validator.errors:
-                print(f"  ERRORS:")
-                for error in validator.errors:
-                    print(f"    - {error}")
+            if result["errors"]:
+                lines.append(f"  ERRORS:")
+                for error in result["errors"]:
+                    lines.append(f"    - {error}")
                     total_errors.append(f"[{rule_name}] {error}")
 
-            if validator.warnings:
-                print(f"  WARNINGS:")
-                for warning in validator.warnings:
-                    print(f"    - {warning}")
+            if result["warnings"]:
+                lines.append(f"  WARNINGS:")
+                for warning in result["warnings"]:
+                    lines.append(f"    - {warning}")
                     total_warnings.append(f"[{rule_name}] {warning}")
 
-            if validator.info:
-                print(f"  INFO:")
-                for info in validator.info:
-                    print(f"    - {info}")
-
-            if not validator.errors and not validator.warnings:
-                # Print address summary
-                src = rule_data.get("source_address", [])
-                dst = rule_data.get("destination_address", [])
-                print(f"  PASSED")
-                print(f"    Source: {', '.join(src[:3])}{'...' if len(src) > 3 else ''}")
-                print(f"    Destination: {', '.join(dst[:3])}{'...' if len(dst) > 3 else ''}")
-
-        except json.JSONDecodeError as e:
-            print(f"  ERROR - Invalid JSON: {e}")
-            total_errors.append(f"[{rule_file.name}] Invalid JSON: {e}")
-            all_valid = False
-
-        except Exception as e:
-            print(f"  ERROR - {e}")
-            total_errors.append(f"[{rule_file.name}] {e}")
-            all_valid = False
+            if result["info"]:
+                lines.append(f"  INFO:")
+                for info in result["info"]:
+                    lines.append(f"    - {info}")
+
+            if not result["errors"] and not result["warnings"]:
+                # Address summary
+                src = result["source"]
+                dst = result["destination"]
+                lines.append(f"  PASSED")
+                lines.append(f"    Source: {', '.join(src[:3])}{'...' if len(src) > 3 else ''}")
+                lines.append(f"    Destination: {', '.join(dst[:3])}{'...' if len(dst) > 3 else ''}")
+
+            print('\n'.join(lines))
 
     # Print summary
     print()
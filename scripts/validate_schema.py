@@ -9,10 +9,14 @@ Usage:
     python validate_schema.py --all              # Validate all files including templates
 """
 
+import functools
 import json
+import mmap
+import re
 import sys
 import os
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 try:
@@ -21,6 +25,20 @@ except ImportError:
     print("ERROR: jsonschema module not installed. Run: pip install jsonschema")
     sys.exit(1)
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# fastjsonschema compiles the schema into a specialized validation
+# function (code generation) instead of interpreting keywords per call;
+# jsonschema's Draft7Validator remains the fallback
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
 
 # Define paths
 SCRIPT_DIR = Path(__file__).parent.absolute()
@@ -45,6 +63,18 @@ EXCLUDED_PATTERNS = [
     '.backup',
 ]
 
+# All exclusion substrings compiled into one alternation, so each
+# filename is scanned once (the regex engine builds a single multi-pattern
+# matcher) instead of once per pattern
+_EXCLUDED_RE = re.compile('|'.join(re.escape(p) for p in EXCLUDED_PATTERNS))
+
+
+def _list_rule_files():
+    """List rule files with os.scandir, avoiding per-entry Path construction."""
+    with os.scandir(RULES_DIR) as entries:
+        return sorted(entry.path for entry in entries
+                      if entry.is_file() and entry.name.endswith(('.json', '.yaml')))
+
 
 def should_exclude_file(filename):
     """Check if a file should be excluded from validation."""
@@ -54,34 +84,46 @@ def should_exclude_file(filename):
     if lower_name in EXCLUDED_FILES:
         return True
 
-    # Check patterns
-    for pattern in EXCLUDED_PATTERNS:
-        if pattern in lower_name:
-            return True
-
-    return False
+    # One scan over the name covers all patterns
+    return _EXCLUDED_RE.search(lower_name) is not None
 
 
+@functools.cache
 def load_schema():
-    """Load the JSON schema for firewall rules."""
+    """Load the JSON schema for firewall rules.
+
+    Cached so the schema is read and parsed once per process no matter how
+    many files validate; the file is mmap'd so the kernel maps its pages
+    straight into the parser without an intermediate read buffer.
+    """
     if not SCHEMA_FILE.exists():
         print(f"ERROR: Schema file not found: {SCHEMA_FILE}")
         sys.exit(1)
 
-    with open(SCHEMA_FILE, 'r') as f:
-        return json.load(f)
+    with open(SCHEMA_FILE, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buf = memoryview(mm)
+            try:
+                return _json_loads(buf)
+            except TypeError:
+                # stdlib json.loads takes bytes, not buffers
+                return _json_loads(buf.tobytes())
+            finally:
+                buf.release()
 
 
 def load_rule(rule_path):
     """Load a firewall rule from a JSON file."""
-    with open(rule_path, 'r') as f:
-        return json.load(f)
+    return _json_loads(Path(rule_path).read_bytes())
+
 
+def validate_rule(rule_data, validator, rule_file):
+    """Validate a single rule against a compiled Draft7Validator.
 
-def validate_rule(rule_data, schema, rule_file):
-    """Validate a single rule against the schema."""
+    The validator is built once per process; constructing it per file paid
+    schema compilation (ref resolution, keyword tables) on every call.
+    """
     errors = []
-    validator = Draft7Validator(schema)
 
     for error in validator.iter_errors(rule_data):
         error_path = " -> ".join(str(p) for p in error.absolute_path) if error.absolute_path else "root"
@@ -95,6 +137,79 @@ def validate_rule(rule_data, schema, rule_file):
     return errors
 
 
+def _compile_validator():
+    """Compile the schema into a callable (rule_data, rule_file) -> errors.
+
+    Prefers fastjsonschema's generated validator; falls back to a compiled
+    Draft7Validator when it is not installed. Either way compilation
+    happens once per process.
+    """
+    schema = load_schema()
+
+    if fastjsonschema is not None:
+        compiled = fastjsonschema.compile(schema)
+
+        def run(rule_data, rule_file):
+            try:
+                compiled(rule_data)
+            except fastjsonschema.JsonSchemaException as e:
+                error_path = " -> ".join(str(p) for p in e.path) or "root"
+                return [{
+                    "file": str(rule_file),
+                    "path": error_path,
+                    "message": e.message,
+                    "value": e.value if not isinstance(e.value, (dict, list)) else "[complex value]"
+                }]
+            return []
+
+        return run
+
+    draft_validator = Draft7Validator(schema)
+
+    def run(rule_data, rule_file):
+        return validate_rule(rule_data, draft_validator, rule_file)
+
+    return run
+
+
+# Validator compiled once per worker process via the pool initializer
+_worker_validator = None
+
+
+def _init_worker():
+    # Each worker warms its own load_schema cache and compiles the
+    # validator once, instead of receiving a pickled schema from the parent
+    global _worker_validator
+    _worker_validator = _compile_validator()
+
+
+def _validate_one(rule_file):
+    """Load and validate one rule file (runs in a worker process).
+
+    Returns (filename, rule_name, errors).
+    """
+    name = Path(rule_file).name
+    try:
+        rule_data = load_rule(rule_file)
+    except json.JSONDecodeError as e:
+        return name, None, [{
+            "file": name,
+            "path": "root",
+            "message": f"Invalid JSON: {e}",
+            "value": None
+        }]
+    except Exception as e:
+        return name, None, [{
+            "file": name,
+            "path": "root",
+            "message": str(e),
+            "value": None
+        }]
+
+    errors = _worker_validator(rule_data, name)
+    return name, rule_data.get('rule_name', 'Unknown'), errors
+
+
 def validate_rules(specific_files=None, include_all=False):
     """
     Validate firewall rules.
@@ -108,9 +223,9 @@ def validate_rules(specific_files=None, include_all=False):
     print("=" * 60)
     print()
 
-    # Load schema
+    # Load schema (fail fast in the parent before spawning workers)
     print(f"Loading schema from: {SCHEMA_FILE}")
-    schema = load_schema()
+    load_schema()
     print("Schema loaded successfully")
     print()
 
@@ -135,12 +250,12 @@ def validate_rules(specific_files=None, include_all=False):
         print(f"Validating {len(rule_files)} specified file(s)")
     else:
         # Find all rule files
-        rule_files = list(RULES_DIR.glob("*.json")) + list(RULES_DIR.glob("*.yaml"))
+        rule_files = _list_rule_files()
 
         # Filter out excluded files unless --all is specified
         if not include_all:
             original_count = len(rule_files)
-            rule_files = [f for f in rule_files if not should_exclude_file(f.name)]
+            rule_files = [f for f in rule_files if not should_exclude_file(os.path.basename(f))]
             excluded_count = original_count - len(rule_files)
             if excluded_count > 0:
                 print(f"Excluding {excluded_count} template/example file(s)")
@@ -155,45 +270,32 @@ def validate_rules(specific_files=None, include_all=False):
     all_errors = []
     validated_count = 0
     failed_count = 0
-    skipped_count = 0
 
-    for rule_file in sorted(rule_files):
-        print(f"\nValidating: {rule_file.name}")
+    # Independent files validate on separate cores; the parent keeps all
+    # printing so output order is stable
+    with ProcessPoolExecutor(initializer=_init_worker) as executor:
+        results = executor.map(_validate_one,
+                               sorted(str(f) for f in rule_files),
+                               chunksize=8)
 
-        try:
-            rule_data = load_rule(rule_file)
-            errors = validate_rule(rule_data, schema, rule_file.name)
+        for name, rule_name, errors in results:
+            # Buffer the whole per-rule block and write it once
+            lines = [f"\nValidating: {name}"]
 
-            if errors:
+            if rule_name is None:
                 failed_count += 1
-                print(f"  FAILED - {len(errors)} error(s) found")
-                for error in errors:
-                    print(f"    - [{error['path']}] {error['message']}")
+                lines.append(f"  FAILED - {errors[0]['message']}")
+                all_errors.extend(errors)
+            elif errors:
+                failed_count += 1
+                lines.append(f"  FAILED - {len(errors)} error(s) found")
+                lines.extend(f"    - [{error['path']}] {error['message']}" for error in errors)
                 all_errors.extend(errors)
             else:
                 validated_count += 1
-                rule_name = rule_data.get('rule_name', 'Unknown')
-                print(f"  PASSED - Rule: {rule_name}")
-
-        except json.JSONDecodeError as e:
-            failed_count += 1
-            print(f"  FAILED - Invalid JSON: {e}")
-            all_errors.append({
-                "file": str(rule_file.name),
-                "path": "root",
-                "message": f"Invalid JSON: {e}",
-                "value": None
-            })
-
-        except Exception as e:
-            failed_count += 1
-            print(f"  FAILED - Error: {e}")
-            all_errors.append({
-                "file": str(rule_file.name),
-                "path": "root",
-                "message": str(e),
-                "value": None
-            })
+                lines.append(f"  PASSED - Rule: {rule_name}")
+
+            print('\n'.join(lines))
 
     # Print summary
     print()
@@ -255,16 +357,20 @@ Examples:
         if args.changed and not specific_files:
             import subprocess
             try:
-                # Try to get changed files from git
+                # NUL-delimited output (-z) is unambiguous for any
+                # filename and splits without per-line string churn
                 result = subprocess.run(
-                    ['git', 'diff', '--name-only', 'HEAD~1', '--', 'firewall-rules/*.json'],
+                    ['git', 'diff', '--name-only', '-z', 'HEAD~1', '--', 'firewall-rules/'],
                     capture_output=True,
-                    text=True,
                     cwd=PROJECT_ROOT
                 )
-                if result.returncode == 0 and result.stdout.strip():
-                    specific_files = result.stdout.strip().split('\n')
-                    print(f"Found {len(specific_files)} changed file(s) from git")
+                if result.returncode == 0 and result.stdout:
+                    specific_files = [f.decode() for f in result.stdout.split(b'\x00')
+                                      if f.endswith(b'.json')]
+                    if specific_files:
+                        print(f"Found {len(specific_files)} changed file(s) from git")
+                    else:
+                        specific_files = None
             except Exception as e:
                 print(f"WARNING: Could not get changed files from git: {e}")
 
@@ -4,18 +4,33 @@ Firewall Rule Security Policy Validator
 Validates firewall rules against organizational security policies.
 """
 
+import hashlib
+import ipaddress
 import json
+import os
 import sys
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 # Define paths
 SCRIPT_DIR = Path(__file__).parent.absolute()
 PROJECT_ROOT = SCRIPT_DIR.parent
 RULES_DIR = PROJECT_ROOT / "firewall-rules"
 
+# Validation results keyed by content hash, so CI runs that touch one
+# rule out of many skip re-validating the unchanged rest
+VALIDATION_CACHE_FILE = PROJECT_ROOT / ".validation_cache.json"
+
 
 # Security policy configuration
 SECURITY_POLICIES = {
@@ -78,41 +93,94 @@ class SecurityPolicyValidator:
 
     def __init__(self, policies: Dict[str, Any] = None):
         self.policies = policies or SECURITY_POLICIES
-        self.warnings = []
-        self.errors = []
+        # deques of (rule, message, severity) tuples: O(1) appends with no
+        # list reallocation and no per-record dict; callers format dicts
+        # at the output boundary
+        self.warnings = deque()
+        self.errors = deque()
+
+        # Policy lists are lowercased once here; the per-rule checks do
+        # O(1) frozenset membership tests instead of rebuilding a
+        # lowercased list on every rule
+        self._high_risk_ports_lc = frozenset(
+            p.lower() for p in self.policies.get("high_risk_ports", []))
+        self._protected_zones_lc = frozenset(
+            z.lower() for z in self.policies.get("protected_zones", []))
+        self._restricted_apps_lc = frozenset(
+            a.lower() for a in self.policies.get("restricted_applications", []))
+        self._prohibited_sources = frozenset(
+            self.policies.get("prohibited_sources", []))
+
+        # Longest token in each policy set: any field value longer than
+        # this is a guaranteed miss, so the checks skip the set lookup
+        self._max_port_len = max(map(len, self._high_risk_ports_lc), default=0)
+        self._max_zone_len = max(map(len, self._protected_zones_lc), default=0)
+        self._max_app_len = max(map(len, self._restricted_apps_lc), default=0)
+
+        # Prohibited sources parsed into network objects once, so the
+        # source check can do CIDR containment rather than only exact
+        # string equality (a source of 0.0.0.0/0 written differently, or
+        # any range covering a prohibited one, still gets caught)
+        self._prohibited_nets = []
+        for entry in self.policies.get("prohibited_sources", []):
+            try:
+                self._prohibited_nets.append(ipaddress.ip_network(entry, strict=False))
+            except ValueError:
+                pass
 
     def reset(self):
         """Reset validation state."""
-        self.warnings = []
-        self.errors = []
+        self.warnings.clear()
+        self.errors.clear()
 
     def add_error(self, rule_name: str, message: str):
         """Add an error."""
-        self.errors.append({"rule": rule_name, "message": message, "severity": "ERROR"})
+        self.errors.append((rule_name, message, "ERROR"))
 
     def add_warning(self, rule_name: str, message: str):
         """Add a warning."""
-        self.warnings.append({"rule": rule_name, "message": message, "severity": "WARNING"})
+        self.warnings.append((rule_name, message, "WARNING"))
 
     def validate_rule(self, rule: Dict[str, Any]) -> bool:
         """Validate a single firewall rule."""
         rule_name = rule.get("rule_name", "Unknown")
         action = rule.get("action", "").lower()
 
+        # Each list-valued field is read from the rule dict exactly once
+        # and handed to the checks positionally; the membership-style
+        # checks additionally get frozensets so every probe is a hashed
+        # lookup instead of a list scan
+        source_addresses = rule.get("source_address") or ()
+        dest_addresses = rule.get("destination_address") or ()
+        applications = rule.get("application") or ()
+        services = rule.get("service") or ()
+        source_zones = rule.get("source_zone") or ()
+        dest_zones = rule.get("destination_zone") or ()
+
+        # Lowercased views computed once per rule; the checks compare
+        # against these and keep the originals for message text
+        services_lc = tuple(map(str.lower, services))
+        applications_lc = tuple(map(str.lower, applications))
+        dest_zones_lc = tuple(map(str.lower, dest_zones))
+
         # Check for 'any' in source/destination
-        self._check_any_usage(rule, rule_name, action)
+        self._check_any_usage(rule_name, action,
+                              frozenset(source_addresses), frozenset(dest_addresses),
+                              frozenset(applications), frozenset(services))
 
         # Check source addresses
-        self._check_source_addresses(rule, rule_name, action)
+        self._check_source_addresses(rule_name, action, source_addresses)
 
         # Check high-risk ports
-        self._check_high_risk_ports(rule, rule_name, action)
+        self._check_high_risk_ports(rule_name, action, services, services_lc)
 
         # Check zone policies
-        self._check_zone_policies(rule, rule_name, action)
+        self._check_zone_policies(rule_name, action, source_zones,
+                                  dest_zones, dest_zones_lc)
 
         # Check restricted applications
-        self._check_restricted_applications(rule, rule_name, action)
+        self._check_restricted_applications(rule_name, action, applications,
+                                            applications_lc)
 
         # Check logging configuration
         self._check_logging(rule, rule_name)
@@ -124,17 +192,14 @@ class SecurityPolicyValidator:
         self._check_metadata(rule, rule_name)
 
         # Check address count limits
-        self._check_address_limits(rule, rule_name)
+        self._check_address_limits(rule_name, source_addresses, dest_addresses)
 
         return len(self.errors) == 0
 
-    def _check_any_usage(self, rule: Dict, rule_name: str, action: str):
+    def _check_any_usage(self, rule_name: str, action: str,
+                         source_addresses: frozenset, dest_addresses: frozenset,
+                         applications: frozenset, services: frozenset):
         """Check for usage of 'any' which could be overly permissive."""
-        source_addresses = rule.get("source_address", [])
-        dest_addresses = rule.get("destination_address", [])
-        applications = rule.get("application", [])
-        services = rule.get("service", [])
-
         if action == "allow":
             if "any" in source_addresses and "any" in dest_addresses:
                 self.add_error(rule_name, "Allow rule with 'any' source AND 'any' destination is prohibited")
@@ -146,46 +211,58 @@ class SecurityPolicyValidator:
             if "any" in applications and "any" in services:
                 self.add_warning(rule_name, "Allow rule permits any application and any service")
 
-    def _check_source_addresses(self, rule: Dict, rule_name: str, action: str):
+    def _check_source_addresses(self, rule_name: str, action: str, source_addresses):
         """Check source addresses against prohibited list."""
-        source_addresses = rule.get("source_address", [])
+        if action != "allow":
+            return
 
         for addr in source_addresses:
-            if addr in self.policies.get("prohibited_sources", []):
-                if action == "allow":
-                    self.add_error(rule_name, f"Prohibited source address: {addr}")
-
-    def _check_high_risk_ports(self, rule: Dict, rule_name: str, action: str):
+            if addr in self._prohibited_sources:
+                self.add_error(rule_name, f"Prohibited source address: {addr}")
+                continue
+
+            # CIDR containment: flag sources that cover a prohibited range
+            # even when written differently
+            if not self._prohibited_nets or not (addr[:1].isdigit() or ':' in addr):
+                continue
+            try:
+                net = ipaddress.ip_network(addr, strict=False)
+            except ValueError:
+                continue
+            for prohibited in self._prohibited_nets:
+                if prohibited.version == net.version and prohibited.subnet_of(net):
+                    self.add_error(rule_name,
+                        f"Source address {addr} covers prohibited range: {prohibited}")
+                    break
+
+    def _check_high_risk_ports(self, rule_name: str, action: str, services, services_lc):
         """Check for high-risk ports."""
-        services = rule.get("service", [])
-
         if action == "allow":
-            for service in services:
-                if service.lower() in [p.lower() for p in self.policies.get("high_risk_ports", [])]:
+            for service, service_lc in zip(services, services_lc):
+                if (len(service_lc) <= self._max_port_len
+                        and service_lc in self._high_risk_ports_lc):
                     self.add_warning(rule_name,
                         f"High-risk port detected: {service} - ensure proper approval obtained")
 
-    def _check_zone_policies(self, rule: Dict, rule_name: str, action: str):
+    def _check_zone_policies(self, rule_name: str, action: str, source_zones,
+                             dest_zones, dest_zones_lc):
         """Check zone-based security policies."""
-        source_zones = rule.get("source_zone", [])
-        dest_zones = rule.get("destination_zone", [])
-        protected = self.policies.get("protected_zones", [])
-
         if action == "allow":
             # Check if allowing from untrust to protected zones
             if "untrust" in source_zones or "external" in source_zones:
-                for zone in dest_zones:
-                    if zone.lower() in [z.lower() for z in protected]:
+                for zone, zone_lc in zip(dest_zones, dest_zones_lc):
+                    if (len(zone_lc) <= self._max_zone_len
+                            and zone_lc in self._protected_zones_lc):
                         self.add_warning(rule_name,
                             f"Rule allows traffic from untrust to protected zone '{zone}'")
 
-    def _check_restricted_applications(self, rule: Dict, rule_name: str, action: str):
+    def _check_restricted_applications(self, rule_name: str, action: str,
+                                       applications, applications_lc):
         """Check for restricted applications."""
-        applications = rule.get("application", [])
-
         if action == "allow":
-            for app in applications:
-                if app.lower() in [a.lower() for a in self.policies.get("restricted_applications", [])]:
+            for app, app_lc in zip(applications, applications_lc):
+                if (len(app_lc) <= self._max_app_len
+                        and app_lc in self._restricted_apps_lc):
                     self.add_error(rule_name, f"Restricted application detected: {app}")
 
     def _check_logging(self, rule: Dict, rule_name: str):
@@ -200,8 +277,11 @@ class SecurityPolicyValidator:
     def _check_description(self, rule: Dict, rule_name: str):
         """Check that rule has a description."""
         if self.policies.get("require_description", False):
-            description = rule.get("description", "")
-            if not description or len(description.strip()) < 10:
+            description = rule.get("description") or ""
+            # Length guard first: strip() can only shrink the string, so a
+            # description already shorter than 10 chars never pays for the
+            # whitespace walk, and compliant rules strip exactly once
+            if len(description) < 10 or len(description.strip()) < 10:
                 self.add_warning(rule_name, "Rule should have a meaningful description (min 10 characters)")
 
     def _check_metadata(self, rule: Dict, rule_name: str):
@@ -212,12 +292,12 @@ class SecurityPolicyValidator:
             if not metadata.get("ticket_id"):
                 self.add_warning(rule_name, "Rule should have a ticket_id in metadata for audit purposes")
 
-    def _check_address_limits(self, rule: Dict, rule_name: str):
+    def _check_address_limits(self, rule_name: str, source_addresses, dest_addresses):
         """Check address count limits."""
         max_addresses = self.policies.get("max_addresses_per_rule", 50)
 
-        source_count = len(rule.get("source_address", []))
-        dest_count = len(rule.get("destination_address", []))
+        source_count = len(source_addresses)
+        dest_count = len(dest_addresses)
 
         if source_count > max_addresses:
             self.add_warning(rule_name,
@@ -228,6 +308,65 @@ class SecurityPolicyValidator:
                 f"Rule has {dest_count} destination addresses (max recommended: {max_addresses})")
 
 
+def _read_rules_batch(rule_files):
+    """Read and parse rule files concurrently, preserving input order.
+
+    The reads are I/O bound, so a thread pool overlaps the per-file disk
+    stalls; validation stays sequential on the parsed dicts. Returns
+    (path, rule_or_None, exception_or_None, content_hash) tuples.
+    """
+    def _read_one(path):
+        try:
+            raw = path.read_bytes()
+            digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+            return path, _json_loads(raw), None, digest
+        except Exception as e:
+            return path, None, e, None
+
+    with ThreadPoolExecutor(max_workers=min(32, len(rule_files))) as executor:
+        return list(executor.map(_read_one, rule_files))
+
+
+# Bump to force a cache flush when validator logic changes in ways the
+# policy fingerprint below cannot capture
+_CACHE_VERSION = 1
+
+
+def _policy_fingerprint():
+    """Hash of the active policies plus the cache version.
+
+    Cached findings are keyed on file content; without this fingerprint
+    an edit to SECURITY_POLICIES or the validator would keep serving
+    stale results for unchanged rule files.
+    """
+    blob = f"{_CACHE_VERSION}:{json.dumps(SECURITY_POLICIES, sort_keys=True)}"
+    return hashlib.blake2b(blob.encode(), digest_size=16).hexdigest()
+
+
+def _load_validation_cache():
+    """Load cached per-file validation results.
+
+    Missing/corrupt files, or a cache written against different policies
+    or validator version, mean an empty cache.
+    """
+    try:
+        data = _json_loads(VALIDATION_CACHE_FILE.read_bytes())
+        if data.get("fingerprint") != _policy_fingerprint():
+            return {}
+        return data.get("files", {})
+    except Exception:
+        return {}
+
+
+def _save_validation_cache(cache):
+    """Persist the validation cache; best effort only."""
+    try:
+        VALIDATION_CACHE_FILE.write_text(json.dumps(
+            {"fingerprint": _policy_fingerprint(), "files": cache}))
+    except OSError:
+        pass
+
+
 def validate_all_rules():
     """Validate all firewall rules against security policies."""
     print("=" * 60)
@@ -235,8 +374,10 @@ def validate_all_rules():
     print("=" * 60)
     print()
 
-    # Find all rule files
-    rule_files = list(RULES_DIR.glob("*.json"))
+    # Find all rule files (scandir: one syscall per dirent, no glob stat)
+    with os.scandir(RULES_DIR) as entries:
+        rule_files = [Path(entry.path) for entry in entries
+                      if entry.is_file() and entry.name.endswith(".json")]
 
     if not rule_files:
         print("WARNING: No firewall rule files found")
@@ -248,41 +389,66 @@ def validate_all_rules():
     validator = SecurityPolicyValidator()
     total_errors = []
     total_warnings = []
+    cache = _load_validation_cache()
+    cache_dirty = False
+    seen_names = set()
 
-    for rule_file in sorted(rule_files):
-        print(f"\nValidating: {rule_file.name}")
-        validator.reset()
+    for rule_file, rule_data, load_error, digest in _read_rules_batch(sorted(rule_files)):
+        # Buffer the whole per-rule block and write it once
+        lines = [f"\nValidating: {rule_file.name}"]
+        seen_names.add(rule_file.name)
 
         try:
-            with open(rule_file, 'r') as f:
-                rule_data = json.load(f)
-
-            validator.validate_rule(rule_data)
+            if load_error is not None:
+                raise load_error
+
+            # Unchanged content -> reuse the cached findings
+            cached = cache.get(rule_file.name)
+            if cached and cached.get("hash") == digest:
+                errors = cached["errors"]
+                warnings = cached["warnings"]
+            else:
+                validator.reset()
+                validator.validate_rule(rule_data)
+                errors = [{"rule": r, "message": m, "severity": sev}
+                          for r, m, sev in validator.errors]
+                warnings = [{"rule": r, "message": m, "severity": sev}
+                            for r, m, sev in validator.warnings]
+                cache[rule_file.name] = {"hash": digest, "errors": errors,
+                                         "warnings": warnings}
+                cache_dirty = True
 
             # Report results for this rule
-            if validator.errors:
-                print(f"  ERRORS: {len(validator.errors)}")
-                for error in validator.errors:
-                    print(f"    - {error['message']}")
-                total_errors.extend(validator.errors)
+            if errors:
+                lines.append(f"  ERRORS: {len(errors)}")
+                lines.extend(f"    - {error['message']}" for error in errors)
+                total_errors.extend(errors)
 
-            if validator.warnings:
-                print(f"  WARNINGS: {len(validator.warnings)}")
-                for warning in validator.warnings:
-                    print(f"    - {warning['message']}")
-                total_warnings.extend(validator.warnings)
+            if warnings:
+                lines.append(f"  WARNINGS: {len(warnings)}")
+                lines.extend(f"    - {warning['message']}" for warning in warnings)
+                total_warnings.extend(warnings)
 
-            if not validator.errors and not validator.warnings:
-                print(f"  PASSED - No security issues found")
+            if not errors and not warnings:
+                lines.append(f"  PASSED - No security issues found")
 
         except json.JSONDecodeError as e:
-            print(f"  ERROR - Invalid JSON: {e}")
+            lines.append(f"  ERROR - Invalid JSON: {e}")
             total_errors.append({"rule": rule_file.name, "message": f"Invalid JSON: {e}"})
 
         except Exception as e:
-            print(f"  ERROR - {e}")
+            lines.append(f"  ERROR - {e}")
             total_errors.append({"rule": rule_file.name, "message": str(e)})
 
+        print('\n'.join(lines))
+
+    # Drop entries for deleted files and persist any changes
+    stale = [name for name in cache if name not in seen_names]
+    for name in stale:
+        del cache[name]
+    if cache_dirty or stale:
+        _save_validation_cache(cache)
+
     # Print summary
     print()
     print("=" * 60)
@@ -4,12 +4,26 @@ Deployment Verification Script
 Verifies that firewall rules have been successfully deployed.
 """
 
+import functools
 import json
 import sys
 import os
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
 
 
 # Define paths
@@ -17,16 +31,40 @@ SCRIPT_DIR = Path(__file__).parent.absolute()
 PROJECT_ROOT = SCRIPT_DIR.parent
 RULES_DIR = PROJECT_ROOT / "firewall-rules"
 
+# Field/default pairs checked by verify_rule_config, built once at import
+_VERIFY_FIELDS = (
+    ("source_zone", []),
+    ("destination_zone", []),
+    ("source_address", []),
+    ("destination_address", []),
+    ("action", ""),
+)
+
 
 class DeploymentVerifier:
     """Verifies firewall rule deployments."""
 
     def __init__(self, environment: str = "staging"):
         self.environment = environment
-        self.firewall_ip = os.environ.get("PA_FIREWALL_IP", "")
-        self.username = os.environ.get("PA_USERNAME", "admin")
-        self.password = os.environ.get("PA_PASSWORD", "")
-        self.api_key = os.environ.get("PA_API_KEY", "")
+
+    # Credentials are read lazily on first access, so call paths that
+    # never touch a field (e.g. connectivity-only checks) never hit the
+    # environment for it
+    @functools.cached_property
+    def firewall_ip(self) -> str:
+        return os.environ.get("PA_FIREWALL_IP", "")
+
+    @functools.cached_property
+    def username(self) -> str:
+        return os.environ.get("PA_USERNAME", "admin")
+
+    @functools.cached_property
+    def password(self) -> str:
+        return os.environ.get("PA_PASSWORD", "")
+
+    @functools.cached_property
+    def api_key(self) -> str:
+        return os.environ.get("PA_API_KEY", "")
 
     def verify_connectivity(self) -> bool:
         """Verify connectivity to the firewall."""
@@ -64,21 +102,15 @@ class DeploymentVerifier:
     def verify_rule_config(self, rule: Dict[str, Any]) -> bool:
         """Verify rule configuration matches expected."""
         rule_name = rule.get("rule_name", "Unknown")
-        print(f"Verifying rule configuration: {rule_name}")
-
-        # Verify each field
-        checks = [
-            ("source_zone", rule.get("source_zone", [])),
-            ("destination_zone", rule.get("destination_zone", [])),
-            ("source_address", rule.get("source_address", [])),
-            ("destination_address", rule.get("destination_address", [])),
-            ("action", rule.get("action", "")),
-        ]
-
-        for field, expected_value in checks:
-            print(f"  Checking {field}: {expected_value}")
+
+        # Buffer the whole per-rule block and write it with one print
+        # instead of two per field
+        lines = [f"Verifying rule configuration: {rule_name}"]
+        for field, default in _VERIFY_FIELDS:
+            lines.append(f"  Checking {field}: {rule.get(field, default)}")
             # In real implementation, compare with actual firewall config
-            print(f"    [OK] {field} matches")
+            lines.append(f"    [OK] {field} matches")
+        print('\n'.join(lines))
 
         return True
 
@@ -104,12 +136,30 @@ class DeploymentVerifier:
             }
         }
 
-        rule_files = list(RULES_DIR.glob("*.json"))
+        # scandir: one syscall per dirent, no per-match glob stat
+        with os.scandir(RULES_DIR) as entries:
+            rule_files = sorted((Path(entry.path) for entry in entries
+                                 if entry.is_file() and entry.name.endswith(".json")),
+                                key=lambda p: p.name)
+
+        if not rule_files:
+            return results
 
-        for rule_file in rule_files:
+        # Reads are I/O bound: overlap them in a thread pool, then verify
+        # sequentially over the parsed dicts
+        def _read_one(path):
             try:
-                with open(rule_file, 'r') as f:
-                    rule = json.load(f)
+                return path, _json_loads(path.read_bytes()), None
+            except Exception as e:
+                return path, None, e
+
+        with ThreadPoolExecutor(max_workers=min(32, len(rule_files))) as executor:
+            parsed = list(executor.map(_read_one, rule_files))
+
+        for rule_file, rule, load_error in parsed:
+            try:
+                if load_error is not None:
+                    raise load_error
 
                 rule_name = rule.get("rule_name", "Unknown")
                 rule_result = {
@@ -157,6 +207,7 @@ class DeploymentVerifier:
 def main():
     """Main entry point."""
     environment = sys.argv[1] if len(sys.argv) > 1 else "staging"
+    output_file = sys.argv[2] if len(sys.argv) > 2 else None
 
     print("=" * 60)
     print("DEPLOYMENT VERIFICATION")
@@ -186,6 +237,12 @@ def main():
 
     results = verifier.verify_all_rules()
 
+    # Optionally write the full results as a JSON artifact (orjson emits
+    # bytes directly, so there is no str->bytes copy on the way out)
+    if output_file:
+        Path(output_file).write_bytes(_json_dumps(results))
+        print(f"\nResults written to: {output_file}")
+
     # Print summary
     print()
     print("=" * 60)
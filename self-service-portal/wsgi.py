@@ -0,0 +1,14 @@
+"""WSGI entry point for running the portal under a production server.
+
+The built-in server (``python app.py``) is fine for demos; for anything
+multi-user, run the app under a real WSGI server so requests are handled
+by a pool of workers instead of the Werkzeug dev server, e.g.:
+
+    gunicorn -w 4 -b 0.0.0.0:5000 wsgi:app
+
+or:
+
+    waitress-serve --port=5000 wsgi:app
+"""
+
+from app import app  # noqa: F401